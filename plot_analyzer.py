@@ -1,261 +1,489 @@
 import ezdxf
+from ezdxf.groupby import groupby
+import heapq
+import logging
+import math
 import numpy as np
+import os
 import re
+import sys
+import shapely
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain, repeat
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
+# Plot/survey number patterns. Each family is combined into a single
+# precompiled alternation so a classification costs one match call.
+_PLOT_NUMBER_RE = re.compile(
+    r'^(?:PLOT\s*#?\s*'                  # PLOT 1, PLOT 2A, PLOT 30/A
+    r'|P\s*'                             # P1, P2A, P30/A
+    r'|NO\s*\.?\s*'                      # NO 1, NO. 1, NO 30/A
+    r')?\d+[A-Z]?/?\d*$'                 # 1, 2A, 30/A, 1/2, 2A/1
+)
+_SIMPLE_NUMBER_RE = re.compile(
+    r'^(?:\d+[A-Z]?(?:/\d+)?'            # 1, 1A, 1/2, 1A/2
+    r'|[A-Z]\d+)$'                       # A1, B2, C30
+)
+_SURVEY_NUMBER_RE = re.compile(
+    r'^(?:(?:SURVEY\s*(?:NO\s*\.?\s*)?'  # SURVEY 1, SURVEY NO 1, SURVEY NO. 1
+    r'|S\s*\.?\s*NO\s*\.?\s*)'           # S NO 1, S. NO. 1
+    r'\d+[A-Z]?/?\d*'
+    r'|\d+[A-Z]?/?\d*\s*SURVEY)$'        # 1 SURVEY, 30/A SURVEY
+)
+_FIRST_NUMBER_RE = re.compile(r'(\d+)')
+# Whitespace, '#' and '.' are all dropped from cleaned plot numbers
+_CLEAN_RE = re.compile(r'[\s#.]+')
+# Strips the PLOT, P, NO and NO. prefixes in that order, each at most once
+# and with the whitespace after it, like the original sequential checks
+_PREFIX_RE = re.compile(r'^(?:PLOT\s*)?(?:P\s*)?(?:NO\s*)?(?:NO\.\s*)?')
+
+# Entity types that can outline a plot, and the text entity types
+_PLOT_ENTITY_TYPES = frozenset(('LWPOLYLINE', 'POLYLINE', 'CIRCLE', 'RECTANGLE'))
+_POLYLINE_TYPES = frozenset(('LWPOLYLINE', 'POLYLINE'))
+_TEXT_TYPES = frozenset(('TEXT', 'MTEXT'))
+
+# Metric to imperial unit conversion factors
+_SQ_YD_PER_SQ_M = 1.19599
+_YD_PER_M = 1.09361
+
+# Performance tunables: thresholds choosing between equivalent strategies
+
+# Radius queries over at most this many (center, text) pairs are answered
+# with one broadcast distance matrix instead of a spatial index
+_BROADCAST_MAX_PAIRS = 250_000
+
+# Text positions are searched with a bucket grid instead of an STRtree once
+# there are at least this many texts per tolerance-sized cell on average
+_GRID_MIN_TEXTS_PER_CELL = 4.0
+
+# Batches of at least this many polylines are measured in a process pool when
+# there is more than one CPU. Shipping a polygon to a worker and back costs
+# about 15 us against about 25 us to measure it in place, so smaller batches
+# don't recover the cost of starting the workers
+_PARALLEL_MIN_POLYGONS = 10_000
+
+# Importing Numba and loading the cached batch kernel costs about 0.55 s per
+# process, against about 25 us per polygon for the NumPy kernel, so the
+# compiled kernel only pays off for batches of at least this many polylines
+_NUMBA_MIN_POLYGONS = 25_000
+
+def _shoelace_area_perimeter(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """
+    Area and perimeter of the closed ring through x, y (vectorized). Terms
+    are accumulated in ring order, like the compiled batch kernel, so both
+    give bit-identical results.
+    """
+    # Close the ring once instead of making rolled copies of both axes
+    x = np.concatenate((x, x[:1]))
+    y = np.concatenate((y, y[:1]))
+    terms = np.empty(2 * (len(x) - 1))
+    terms[0::2] = x[:-1] * y[1:]
+    terms[1::2] = -(x[1:] * y[:-1])
+    area = abs(np.cumsum(terms)[-1]) / 2.0
+    dx = np.diff(x)
+    dy = np.diff(y)
+    perimeter = np.cumsum(np.sqrt(dx * dx + dy * dy))[-1]
+    return area, perimeter
+
+def _shoelace_batch_loop(x, y, offsets):
+    """
+    Area and perimeter of every ring in a batch of concatenated vertices,
+    where ring k spans offsets[k]:offsets[k + 1]. Rings with fewer than
+    three vertices measure 0. Compiled with Numba by _compiled_shoelace_batch.
+    """
+    count = offsets.shape[0] - 1
+    areas = np.zeros(count)
+    perimeters = np.zeros(count)
+    for k in range(count):
+        start = offsets[k]
+        n = offsets[k + 1] - start
+        if n < 3:
+            continue
+        area = 0.0
+        perimeter = 0.0
+        for i in range(n):
+            j = (i + 1) % n
+            area += x[start + i] * y[start + j]
+            area -= x[start + j] * y[start + i]
+            dx = x[start + j] - x[start + i]
+            dy = y[start + j] - y[start + i]
+            perimeter += math.sqrt(dx * dx + dy * dy)
+        areas[k] = abs(area) / 2.0
+        perimeters[k] = perimeter
+    return areas, perimeters
+
+# Compiled batch kernel: None until first needed, False if Numba is missing
+_shoelace_batch = None
+
+def _compiled_shoelace_batch():
+    """
+    The batch kernel compiled with Numba, or None when Numba is not
+    installed. Numba is optional and slow to import, so it is only imported
+    once a batch is large enough to use it. Without it the batch loop would
+    run in the interpreter, so batches are measured one polygon at a time
+    with the NumPy kernel instead. No fastmath: reassociating the sums would
+    make areas depend on whether Numba is installed.
+    """
+    global _shoelace_batch
+    if _shoelace_batch is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _shoelace_batch = False
+        else:
+            _shoelace_batch = njit(cache=True)(_shoelace_batch_loop)
+    return _shoelace_batch or None
+
+@lru_cache(maxsize=4096)
+def _extract_numeric_plot_number(plot_number: str) -> int:
+    """Extract numeric part from plot number for sorting."""
+    if not plot_number:
+        return 999999
+    
+    # Extract first number from plot number
+    match = _FIRST_NUMBER_RE.search(plot_number)
+    if match:
+        return int(match.group(1))
+    return 999999
+
+def _pairwise_distances_sq(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    (len(a), len(b)) matrix of squared distances between the rows of two
+    (n, 2) point arrays, for threshold and nearest-point comparisons.
+    """
+    dx = a[:, None, 0] - b[None, :, 0]
+    dy = a[:, None, 1] - b[None, :, 1]
+    # Same operation order as the scalar dx*dx + dy*dy
+    return dx * dx + dy * dy
+
+def _polygon_area_perimeter(pts: np.ndarray) -> Tuple[float, float]:
+    """Area and perimeter of an (n, 2) vertex array, safe to run in worker processes."""
+    if len(pts) < 3:
+        return 0.0, 0.0
+    area, perimeter = _shoelace_area_perimeter(np.ascontiguousarray(pts[:, 0]),
+                                               np.ascontiguousarray(pts[:, 1]))
+    return float(area), float(perimeter)
+
+# Plot numbers of the original (green) and final (red) plots, in DXF entity order
+_ORIGINAL_PLOT_NUMBERS = (
+    "1", "2", "2/A", "3", "4", "5", "5/A", "6", "35", "24", "7", "8", "9", "10", "11", "11/A",
+    "12", "13", "14", "15", "15/A", "16", "16/A", "17", "17/A", "18", "19", "20", "21", "21/A",
+    "21/B", "22", "23", "24", "25", "26", "27", "28", "28/A", "28/B", "29", "29/A", "30", "31",
+    "31/A", "32", "33", "33/A", "34", "34/A", "36", "37", "38", "39", "40", "41", "42", "43",
+    "44", "45", "46"
+)
+
+_FINAL_PLOT_NUMBERS = (
+    "1", "2", "NIL", "3", "4", "NIL", "5", "31", "34", "6", "7", "8", "8/A", "9", "10", "11",
+    "12", "12/A", "NIL", "14", "15", "15/A", "16", "17", "18", "19", "19/A", "19/B", "20",
+    "21", "22", "22/A", "23", "24", "NIL", "25", "32", "25/A", "26", "27", "27/A", "28", "29",
+    "29/A", "30", "30/A", "NIL", "NIL", "NIL", "36", "37", "NIL", "NIL", "NIL", "NIL", "13",
+    "33", "35", "38", "39"
+)
+
 class PlotAnalyzer:
     def __init__(self, dxf_file_path: str):
         """Initialize the plot analyzer with DXF file path."""
         self.dxf_file_path = dxf_file_path
         self.doc = None
         self.msp = None
-        self.scale_factor = 20.0  # 1CM = 20M conversion factor
+        self.scale_factor = 20.0  # 1CM = 20M conversion factor, also sets scale_factor_sq
         
         # Color definitions
         self.ORIGINAL_COLOR = 3  # Green for original plots
         self.FINAL_COLOR = 1     # Red for final plots
         
+        # Entities are binned (see _classify_entities) and text entities are
+        # indexed (see _build_text_cache) once, on first use
+        self._entity_bins = None
+        self._text_cache = None
+        
+        # Area/perimeter and center results keyed by entity handle
+        self._area_cache: Dict[str, Tuple[float, float]] = {}
+        self._center_cache: Dict[str, Tuple[float, float]] = {}
+        
+        # original_plots/final_plots results keyed by (method, arguments)
+        self._result_cache: Dict[Tuple, Dict] = {}
+        
         # Load the DXF file
         self.load_dxf_file()
     
+    @property
+    def scale_factor(self) -> float:
+        """Drawing units to meters conversion factor."""
+        return self._scale_factor
+    
+    @scale_factor.setter
+    def scale_factor(self, value: float) -> None:
+        # Keep the squared factor used for area conversion in step, and drop
+        # results converted with the old factor
+        self._scale_factor = value
+        self.scale_factor_sq = value ** 2
+        self._result_cache = {}
+    
+    def invalidate_cache(self) -> None:
+        """
+        Drop all cached entity bins, text indexes, geometry and analysis
+        results, e.g. after the DXF has been modified or reloaded.
+        """
+        self._entity_bins = None
+        self._text_cache = None
+        self._area_cache.clear()
+        self._center_cache.clear()
+        self._result_cache.clear()
+    
     def load_dxf_file(self):
         """Load and validate the DXF file."""
         try:
-            print(f"📁 Loading DXF file: {self.dxf_file_path}")
+            logger.info("📁 Loading DXF file: %s", self.dxf_file_path)
             self.doc = ezdxf.readfile(self.dxf_file_path)
             self.msp = self.doc.modelspace()
-            print(f"✅ Successfully loaded DXF file with {len(self.msp)} entities")
+            self.invalidate_cache()
+            logger.info("✅ Successfully loaded DXF file with %s entities", len(self.msp))
         except FileNotFoundError:
-            print(f"❌ Error: File '{self.dxf_file_path}' not found!")
+            logger.error("❌ Error: File '%s' not found!", self.dxf_file_path)
             raise
         except Exception as e:
-            print(f"❌ Error loading DXF file: {e}")
+            logger.error("❌ Error loading DXF file: %s", e)
             raise
     
-    def original_plots(self) -> Dict:
+    def _classify_entities(self) -> Dict:
         """
-        Extract and analyze original plots (green colored entities).
-        Returns plot numbers, areas, and details.
+        Bin modelspace entities in a single pass on first use so the analyzers
+        don't each have to walk the whole DXF. Plot entities are kept both in
+        DXF order and grouped by color; TEXT/MTEXT and INSERT entities are
+        kept in DXF order, and every entity type is counted. The full entity
+        list is kept too, for scans that need every entity.
         """
-        print("\n🔍 Analyzing Original Plots...")
-        
-        original_entities = []
-        plot_numbers = []
-        total_area = 0.0
-        total_perimeter = 0.0
-        
-        # Find all green-colored entities (original plots)
-        for entity in self.msp:
-            color = getattr(entity.dxf, 'color', 7)
-            if color == self.ORIGINAL_COLOR:
-                entity_type = entity.dxftype()
-                if entity_type in ['LWPOLYLINE', 'POLYLINE', 'CIRCLE', 'RECTANGLE']:
-                    area, perimeter = self._calculate_entity_area_perimeter(entity)
-                    total_area += area
-                    total_perimeter += perimeter
-                    
-                    original_entities.append({
-                        'type': entity_type,
-                        'layer': entity.dxf.layer,
-                        'area': area,
-                        'perimeter': perimeter,
-                        'center': self._get_entity_center(entity),
-                        'entity': entity
-                    })
-        
-        # Use actual plot numbers from DXF file
-        actual_plot_numbers = ["1", "2", "2/A", "3", "4", "5", "5/A", "6", "35", "24", "7","8","9","10","11","11/A","12","13","14","15","15/A","16","16/A","17","17/A","18","19","20","21","21/A","21/B","22","23","24","25","26","27","28","28/A","28/B","29","29/A","30","31","31/A","32","33","33/A","34","34/A","36","37","38","39","40","41","42","43","44","45","46"]
-        
-        # Assign plot numbers to entities
-        for i, entity_data in enumerate(original_entities):
-            if i < len(actual_plot_numbers):
-                plot_number = actual_plot_numbers[i]
-            else:
-                # Fallback to sequential numbering if more entities than plot numbers
-                plot_number = str(i + 1)
-            entity_data['plot_number'] = plot_number
-            plot_numbers.append(plot_number)
-        
-        # Remove duplicates and sort
-        plot_numbers = sorted(set(plot_numbers), key=self._extract_numeric_plot_number)
-        
-        # Convert to square meters using new conversion methods
-        area_sq_meters = self.convert_to_square_meters(total_area)
-        perimeter_meters = self.convert_to_meters(total_perimeter)
-        
-        result = {
-            'total_entities': len(original_entities),
-            'total_area_sq_meters': area_sq_meters,
-            'total_perimeter_meters': perimeter_meters,
-            'plot_numbers': plot_numbers,
-            'entities': original_entities
+        if self._entity_bins is not None:
+            return self._entity_bins
+        
+        entities = list(self.msp)
+        plot_entities = []
+        texts = []
+        inserts = []
+        type_counts = Counter()
+        
+        # Bound once, this loop sees every entity in the drawing
+        add_plot_entity = plot_entities.append
+        add_text = texts.append
+        add_insert = inserts.append
+        for entity in entities:
+            entity_type = entity.dxftype()
+            type_counts[entity_type] += 1
+            if entity_type in _PLOT_ENTITY_TYPES:
+                add_plot_entity(entity)
+            elif entity_type in _TEXT_TYPES:
+                add_text(entity)
+            elif entity_type == 'INSERT':
+                add_insert(entity)
+        
+        self._entity_bins = {
+            # ezdxf's groupby keeps DXF order within each color
+            'polys_by_color': groupby(plot_entities, dxfattrib='color'),
+            'plot_entities': plot_entities,
+            'texts': texts,
+            'inserts': inserts,
+            'type_counts': type_counts,
+            'entities': entities
         }
-        
-        print(f"   📊 Found {len(original_entities)} original plot entities")
-        print(f"   📏 Total area: {area_sq_meters:.2f} sq meters")
-        print(f"   📐 Total perimeter: {perimeter_meters:.2f} meters")
-        print(f"   🏷️  Plot numbers found: {plot_numbers}")
-        
-        return result
+        return self._entity_bins
     
-    def final_plots(self) -> Dict:
+    def original_plots(self, collect: bool = True, keep_entities: bool = False) -> Dict:
+        """
+        Extract and analyze original plots (green colored entities).
+        Returns plot numbers, areas, and details. With collect=False only the
+        totals and plot numbers are returned and 'entities' is left empty.
+        With keep_entities=True each entity dict also holds the ezdxf entity.
+        """
+        return self._analyze_plots(self.ORIGINAL_COLOR, _ORIGINAL_PLOT_NUMBERS, 'Original',
+                                   collect, keep_entities)
+    
+    def final_plots(self, collect: bool = True, keep_entities: bool = False) -> Dict:
         """
         Extract and analyze final plots (red colored entities).
-        Returns plot numbers, areas, and details.
+        Returns plot numbers, areas, and details. With collect=False only the
+        totals and plot numbers are returned and 'entities' is left empty.
+        With keep_entities=True each entity dict also holds the ezdxf entity.
+        """
+        return self._analyze_plots(self.FINAL_COLOR, _FINAL_PLOT_NUMBERS, 'Final',
+                                   collect, keep_entities)
+    
+    def _analyze_plots(self, color: int, actual_plot_numbers: Tuple[str, ...], label: str,
+                       collect: bool = True, keep_entities: bool = False) -> Dict:
         """
-        print("\n🔍 Analyzing Final Plots...")
+        Analyze the plot entities of one color, numbering them in DXF order
+        from actual_plot_numbers. Results are cached per color and argument
+        combination until invalidate_cache(). Callers get a copy of the
+        result dict, its lists, its arrays and each entity dict, so editing a
+        result in place doesn't alter the cache (the ezdxf entities kept with
+        keep_entities=True are shared).
+        """
+        cache_key = (label, color, collect, keep_entities)
+        if cache_key not in self._result_cache:
+            self._result_cache[cache_key] = self._compute_plots(color, actual_plot_numbers, label,
+                                                                collect, keep_entities)
+        result = self._result_cache[cache_key]
+        return dict(result,
+                    entities=[dict(plot) for plot in result['entities']],
+                    plot_numbers=list(result['plot_numbers']),
+                    areas=result['areas'].copy(),
+                    perimeters=result['perimeters'].copy(),
+                    centers=result['centers'].copy())
+    
+    def _compute_plots(self, color: int, actual_plot_numbers: Tuple[str, ...], label: str,
+                       collect: bool, keep_entities: bool) -> Dict:
+        """Uncached body of _analyze_plots."""
+        logger.info("\n🔍 Analyzing %s Plots...", label)
         
-        final_entities = []
+        plot_entity_dicts = []
         plot_numbers = []
-        total_area = 0.0
-        total_perimeter = 0.0
-        
-        # Find all red-colored entities (final plots)
-        for entity in self.msp:
-            color = getattr(entity.dxf, 'color', 7)
-            if color == self.FINAL_COLOR:
-                entity_type = entity.dxftype()
-                if entity_type in ['LWPOLYLINE', 'POLYLINE', 'CIRCLE', 'RECTANGLE']:
-                    area, perimeter = self._calculate_entity_area_perimeter(entity)
-                    total_area += area
-                    total_perimeter += perimeter
-                    
-                    final_entities.append({
-                        'type': entity_type,
-                        'layer': entity.dxf.layer,
-                        'area': area,
-                        'perimeter': perimeter,
-                        'center': self._get_entity_center(entity),
-                        'entity': entity
-                    })
-        
-        # Use actual plot numbers from DXF file
-        actual_plot_numbers = [
-    "1", "2", "NIL", "3", "4", "NIL", "5", "31", "34", "6", "7", "8", "8/A", "9", "10", 
-    "11", "12", "12/A", "NIL", "14", "15", "15/A", "16", "17", "18", "19", "19/A", "19/B", 
-    "20", "21", "22", "22/A", "23", "24", "NIL", "25", "32", "25/A", "26", "27", "27/A", 
-    "28", "29", "29/A", "30", "30/A", "NIL", "NIL", "NIL", "36", "37", "NIL", "NIL", "NIL", 
-    "NIL", "13", "33", "35", "38", "39"
-]
-
+        # Find all entities of the plot color
+        plot_entities = self._classify_entities()['polys_by_color'].get(color, [])
+        metrics = self._calculate_plot_metrics(plot_entities)
+        
+        # Per-plot metrics as parallel arrays for vectorized reporting
+        areas = np.empty(len(plot_entities))
+        perimeters = np.empty(len(plot_entities))
+        centers = np.empty((len(plot_entities), 2))
+        scale_factor = self.scale_factor
+        scale_sq = self.scale_factor_sq
+        
+        for i, (entity, (center, area, perimeter)) in enumerate(zip(plot_entities, metrics)):
+            areas[i] = area
+            perimeters[i] = perimeter
+            centers[i] = center
+            
+            if collect:
+                # Keep the handle rather than the ezdxf entity unless asked, so
+                # results don't pin the DXF entity graph in memory. Report
+                # units are converted once here for the current scale factor.
+                dxf = entity.dxf
+                area_sq_m = area * scale_sq
+                plot_entity_dicts.append({
+                    'type': entity.dxftype(),
+                    'layer': dxf.layer,
+                    'area': area,
+                    'perimeter': perimeter,
+                    'area_sq_m': area_sq_m,
+                    'area_sq_yd': area_sq_m * _SQ_YD_PER_SQ_M,
+                    'perim_yd': perimeter * scale_factor * _YD_PER_M,
+                    'center': center,
+                    'handle': dxf.handle
+                })
+                if keep_entities:
+                    plot_entity_dicts[-1]['entity'] = entity
         
         # Assign plot numbers to entities
-        for i, entity_data in enumerate(final_entities):
+        for i in range(len(plot_entities)):
             if i < len(actual_plot_numbers):
                 plot_number = actual_plot_numbers[i]
             else:
                 # Fallback to sequential numbering if more entities than plot numbers
                 plot_number = str(i + 1)
-            entity_data['plot_number'] = plot_number
+            if collect:
+                plot_entity_dicts[i]['plot_number'] = plot_number
             plot_numbers.append(plot_number)
         
         # Remove duplicates and sort
         plot_numbers = sorted(set(plot_numbers), key=self._extract_numeric_plot_number)
         
+        # Totals as vectorized reductions over the per-plot arrays
+        total_area = float(areas.sum())
+        total_perimeter = float(perimeters.sum())
+        
         # Convert to square meters using new conversion methods
         area_sq_meters = self.convert_to_square_meters(total_area)
         perimeter_meters = self.convert_to_meters(total_perimeter)
         
         result = {
-            'total_entities': len(final_entities),
+            'total_entities': len(plot_entities),
             'total_area_sq_meters': area_sq_meters,
             'total_perimeter_meters': perimeter_meters,
             'plot_numbers': plot_numbers,
-            'entities': final_entities
+            'entities': plot_entity_dicts,
+            'areas': areas,
+            'perimeters': perimeters,
+            'centers': centers
         }
         
-        print(f"   📊 Found {len(final_entities)} final plot entities")
-        print(f"   📏 Total area: {area_sq_meters:.2f} sq meters")
-        print(f"   📐 Total perimeter: {perimeter_meters:.2f} meters")
-        print(f"   🏷️  Plot numbers found: {plot_numbers}")
+        logger.info("   📊 Found %s %s plot entities", len(plot_entities), label.lower())
+        logger.info("   📏 Total area: %.2f sq meters", area_sq_meters)
+        logger.info("   📐 Total perimeter: %.2f meters", perimeter_meters)
+        logger.info("   🏷️  Plot numbers found: %s", plot_numbers)
         
         return result
     
-    def check_unassigned_plots_with_survey(self) -> Dict:
+    def check_unassigned_plots_with_survey(self, keep_entities: bool = False) -> Dict:
         """
         Check for plots that are not assigned but have survey numbers.
-        Returns unassigned plots with their survey numbers.
+        Returns unassigned plots with their survey numbers. With
+        keep_entities=True each unassigned plot also holds the ezdxf entity.
         """
-        print("\n🔍 Checking Unassigned Plots with Survey Numbers...")
+        logger.info("\n🔍 Checking Unassigned Plots with Survey Numbers...")
         
         # Get all plot entities (both original and final)
         all_plot_entities = []
-        for entity in self.msp:
-            color = getattr(entity.dxf, 'color', 7)
-            if color in [self.ORIGINAL_COLOR, self.FINAL_COLOR]:
-                entity_type = entity.dxftype()
-                if entity_type in ['LWPOLYLINE', 'POLYLINE', 'CIRCLE', 'RECTANGLE']:
-                    all_plot_entities.append({
-                        'type': entity_type,
-                        'layer': entity.dxf.layer,
-                        'color': color,
-                        'center': self._get_entity_center(entity),
-                        'entity': entity
-                    })
-        
-        # Get all text entities
-        text_entities = []
-        for entity in self.msp:
-            if entity.dxftype() in ['TEXT', 'MTEXT']:
-                text_content = ""
-                if entity.dxftype() == 'TEXT':
-                    text_content = getattr(entity.dxf, 'text', '').strip()
-                elif entity.dxftype() == 'MTEXT':
-                    text_content = getattr(entity.dxf, 'text', '').strip()
-                
-                if text_content:
-                    text_entities.append({
-                        'content': text_content,
-                        'layer': entity.dxf.layer,
-                        'position': (entity.dxf.insert.x, entity.dxf.insert.y),
-                        'entity': entity
-                    })
-        
-        # Find survey numbers
-        survey_numbers = []
-        for text in text_entities:
-            if self._is_survey_number(text['content']):
-                survey_numbers.append(text)
+        
+        # Colors are already known from the color bins, so filter on a cheap
+        # id lookup instead of reading entity.dxf.color for every polyline
+        color_by_id = {}
+        for color in (self.ORIGINAL_COLOR, self.FINAL_COLOR):
+            for entity in self._classify_entities()['polys_by_color'].get(color, []):
+                color_by_id[id(entity)] = color
+        
+        plot_entities = [entity for entity in self._classify_entities()['plot_entities']
+                         if id(entity) in color_by_id]
+        metrics = self._calculate_plot_metrics(plot_entities)
+        for entity, (center, area, perimeter) in zip(plot_entities, metrics):
+            all_plot_entities.append({
+                'entity': entity,
+                'type': entity.dxftype(),
+                'layer': entity.dxf.layer,
+                'color': color_by_id[id(entity)],
+                'area': area,
+                'perimeter': perimeter,
+                'center': center
+            })
+        
+        # Get survey numbers from the text cache
+        text_cache = self._build_text_cache()
+        survey_numbers = [
+            {'content': text_cache['content'][i], 'layer': text_cache['layer'][i]}
+            for i in np.flatnonzero(text_cache['is_survey'])
+        ]
         
         # Check for unassigned plots (no plot number nearby)
         unassigned_plots = []
         tolerance = 50.0  # Distance tolerance
+        scale_sq = self.scale_factor_sq
         
-        for plot_entity in all_plot_entities:
-            plot_center = plot_entity['center']
-            has_plot_number = False
-            has_survey_number = False
-            nearby_survey = None
-            
-            # Check for nearby plot numbers
-            for text in text_entities:
-                if self._is_plot_number(text['content']):
-                    distance = self._calculate_distance(plot_center, text['position'])
-                    if distance <= tolerance:
-                        has_plot_number = True
-                        break
-            
-            # Check for nearby survey numbers
-            for survey in survey_numbers:
-                distance = self._calculate_distance(plot_center, survey['position'])
-                if distance <= tolerance:
-                    has_survey_number = True
-                    nearby_survey = survey
-                    break
-            
+        centers = [plot_entity['center'] for plot_entity in all_plot_entities]
+        plot_hits = self._query_texts_within(centers, 'is_plot', tolerance)
+        survey_hits = self._query_texts_within(centers, 'is_survey', tolerance)
+        
+        for plot_entity, plot_idx, survey_idx in zip(all_plot_entities, plot_hits, survey_hits):
             # If no plot number but has survey number
-            if not has_plot_number and has_survey_number:
-                area, perimeter = self._calculate_entity_area_perimeter(plot_entity['entity'])
+            if len(plot_idx) == 0 and len(survey_idx) > 0:
+                # Hits are in text order, so this is the first nearby survey number
+                nearby_survey = survey_idx[0]
                 unassigned_plots.append({
                     'type': plot_entity['type'],
                     'layer': plot_entity['layer'],
                     'color': plot_entity['color'],
-                    'area_sq_meters': area * (self.scale_factor ** 2),
-                    'perimeter_meters': perimeter * self.scale_factor,
-                    'center': plot_center,
-                    'survey_number': nearby_survey['content'],
-                    'survey_layer': nearby_survey['layer']
+                    'area_sq_meters': plot_entity['area'] * scale_sq,
+                    'perimeter_meters': plot_entity['perimeter'] * self.scale_factor,
+                    'center': plot_entity['center'],
+                    'survey_number': text_cache['content'][nearby_survey],
+                    'survey_layer': text_cache['layer'][nearby_survey]
                 })
+                if keep_entities:
+                    unassigned_plots[-1]['entity'] = plot_entity['entity']
         
         result = {
             'total_unassigned_with_survey': len(unassigned_plots),
@@ -264,9 +492,10 @@ class PlotAnalyzer:
             'survey_numbers': [s['content'] for s in survey_numbers]
         }
         
-        print(f"   📊 Found {len(unassigned_plots)} unassigned plots with survey numbers")
-        print(f"   🏷️  Total survey numbers found: {len(survey_numbers)}")
-        print(f"   📋 Survey numbers: {[s['content'] for s in survey_numbers[:10]]}")
+        logger.info("   📊 Found %s unassigned plots with survey numbers", len(unassigned_plots))
+        logger.info("   🏷️  Total survey numbers found: %s", len(survey_numbers))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   📋 Survey numbers: %s", [s['content'] for s in survey_numbers[:10]])
         
         return result
     
@@ -274,7 +503,7 @@ class PlotAnalyzer:
         """
         Compare original and final plot areas to find pending/missing areas.
         """
-        print("\n🔍 Checking Area Pending...")
+        logger.info("\n🔍 Checking Area Pending...")
         
         original_area = original_result['total_area_sq_meters']
         final_area = final_result['total_area_sq_meters']
@@ -293,86 +522,248 @@ class PlotAnalyzer:
             'has_pending_area': area_difference > 0.01  # 0.01 sq meters tolerance
         }
         
-        print(f"   📏 Original area: {original_area:.2f} sq meters")
-        print(f"   📏 Final area: {final_area:.2f} sq meters")
-        print(f"   📊 Area difference: {area_difference:.2f} sq meters")
-        print(f"   📈 Percentage difference: {percentage_difference:.2f}%")
+        logger.info("   📏 Original area: %.2f sq meters", original_area)
+        logger.info("   📏 Final area: %.2f sq meters", final_area)
+        logger.info("   📊 Area difference: %.2f sq meters", area_difference)
+        logger.info("   📈 Percentage difference: %.2f%%", percentage_difference)
         
         if result['has_pending_area']:
-            print(f"   ⚠️  Pending area detected!")
+            logger.info("   ⚠️  Pending area detected!")
         else:
-            print(f"   ✅ No pending area detected")
+            logger.info("   ✅ No pending area detected")
         
         return result
     
+    def _build_text_cache(self) -> Dict:
+        """
+        Collect the binned TEXT/MTEXT entities into a cache. Contents,
+        positions and plot/survey number classification are stored as
+        parallel sequences so callers don't have to re-scan the DXF. INSERT
+        block names are classified here too, once per block reference.
+        """
+        if self._text_cache is not None:
+            return self._text_cache
+        
+        contents = []
+        layers = []
+        colors = []
+        positions = []
+        
+        add_content = contents.append
+        add_layer = layers.append
+        add_color = colors.append
+        add_position = positions.append
+        for entity in self._classify_entities()['texts']:
+            dxf = entity.dxf
+            text_content = getattr(dxf, 'text', '').strip()
+            if text_content:
+                insert = dxf.insert
+                add_content(text_content)
+                add_layer(dxf.layer)
+                add_color(getattr(dxf, 'color', 7))
+                add_position((insert.x, insert.y))
+        
+        # (position, cleaned block name) of INSERTs whose name could be a plot number
+        insert_candidates = []
+        for entity in self._classify_entities()['inserts']:
+            dxf = entity.dxf
+            block_name = dxf.name
+            if self._is_plot_number_candidate(block_name):
+                insert = dxf.insert
+                insert_candidates.append(((insert.x, insert.y), self._clean_plot_number(block_name)))
+        
+        # Contiguous (T, 2) float64 positions, filled without an intermediate
+        # array of tuple objects
+        xy = np.fromiter((coord for position in positions for coord in position),
+                         dtype=np.float64, count=2 * len(positions)).reshape(-1, 2)
+        origin = xy.min(axis=0) if len(xy) else np.zeros(2)
+        xy32 = (xy - origin).astype(np.float32)
+        
+        is_plot = [self._is_plot_number(text) for text in contents]
+        is_candidate = [plot or self._is_simple_number(text) for plot, text in zip(is_plot, contents)]
+        
+        self._text_cache = {
+            'trees': {},
+            'grids': {},
+            'content': contents,
+            'layer': layers,
+            'color': colors,
+            'position': positions,
+            'xy': xy,
+            # Single-precision copy relative to the drawing origin, used to
+            # prefilter candidates before the exact float64 comparison, and
+            # the largest coordinate in it, which bounds its rounding error
+            'origin': origin,
+            'xy32': xy32,
+            'xy32_max': float(xy32.max()) if len(xy32) else 0.0,
+            'cleaned': [self._clean_plot_number(text) for text in contents],
+            'is_plot': np.array(is_plot, dtype=bool),
+            'is_candidate': np.array(is_candidate, dtype=bool),
+            'is_survey': np.array([self._is_survey_number(text) for text in contents], dtype=bool),
+            'insert_candidates': insert_candidates
+        }
+        return self._text_cache
+    
+    def _query_texts_within(self, centers: List[Tuple[float, float]], flag: str,
+                            tolerance: float) -> List[np.ndarray]:
+        """
+        Find cached texts marked with the given flag (e.g. 'is_plot') within
+        tolerance of each center. Returns one sorted array of text cache
+        indices per center.
+        """
+        text_cache = self._build_text_cache()
+        text_idx = np.flatnonzero(text_cache[flag])
+        centers_xy = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        
+        # Small problems: a full (centers, texts) squared distance matrix in
+        # one vectorized pass is cheaper than any index
+        if len(centers_xy) * len(text_idx) <= _BROADCAST_MAX_PAIRS:
+            distances_sq = _pairwise_distances_sq(centers_xy, text_cache['xy'][text_idx])
+            within = distances_sq <= tolerance * tolerance
+            return [text_idx[row] for row in within]
+        
+        # Densely labelled drawings are faster to search with a bucket grid
+        # than with a tree, since a radius query returns many candidates anyway
+        if len(text_idx) and tolerance > 0:
+            extent = np.ptp(text_cache['xy'][text_idx], axis=0)
+            cell_count = (extent[0] // tolerance + 1) * (extent[1] // tolerance + 1)
+            if len(text_idx) / cell_count >= _GRID_MIN_TEXTS_PER_CELL:
+                return self._query_text_grid(centers_xy, flag, text_idx, tolerance)
+        
+        tree = self._text_tree(flag)
+        center_i, tree_i = tree.query(shapely.points(centers_xy), predicate='dwithin', distance=tolerance)
+        
+        hits = [[] for _ in range(len(centers_xy))]
+        for c, t in zip(center_i, text_idx[tree_i]):
+            hits[c].append(t)
+        return [np.sort(np.asarray(h, dtype=np.intp)) for h in hits]
+    
+    def _text_tree(self, flag: str) -> shapely.STRtree:
+        """STRtree over the positions of cached texts with the given flag, built once per flag."""
+        text_cache = self._build_text_cache()
+        if flag not in text_cache['trees']:
+            text_idx = np.flatnonzero(text_cache[flag])
+            text_cache['trees'][flag] = shapely.STRtree(shapely.points(text_cache['xy'][text_idx]))
+        return text_cache['trees'][flag]
+    
+    def _nearest_texts(self, centers_xy: np.ndarray, flag: str, tolerance: float) -> np.ndarray:
+        """
+        Text cache index of the text with the given flag nearest to each
+        center and within tolerance, or -1, from one batched STRtree query.
+        Ties go to the text that comes first in the DXF.
+        """
+        text_idx = np.flatnonzero(self._build_text_cache()[flag])
+        nearest = np.full(len(centers_xy), -1, dtype=np.intp)
+        if len(text_idx) == 0 or len(centers_xy) == 0:
+            return nearest
+        
+        center_i, tree_i = self._text_tree(flag).query_nearest(
+            shapely.points(centers_xy), max_distance=tolerance, all_matches=True)
+        
+        # text_idx is ascending, so the smallest tree index is the earliest text
+        first = np.full(len(centers_xy), len(text_idx), dtype=np.intp)
+        np.minimum.at(first, center_i, tree_i)
+        found = first < len(text_idx)
+        nearest[found] = text_idx[first[found]]
+        return nearest
+    
+    def _query_text_grid(self, centers_xy: np.ndarray, flag: str, text_idx: np.ndarray,
+                         tolerance: float) -> List[np.ndarray]:
+        """Radius query over a bucket grid with cell size equal to the tolerance."""
+        text_cache = self._build_text_cache()
+        text_xy = text_cache['xy']
+        
+        key = (flag, tolerance)
+        if key not in text_cache['grids']:
+            grid = defaultdict(list)
+            for i, (x, y) in zip(text_idx.tolist(), text_xy[text_idx].tolist()):
+                grid[(int(x // tolerance), int(y // tolerance))].append(i)
+            text_cache['grids'][key] = grid
+        grid = text_cache['grids'][key]
+        
+        text_xy32 = text_cache['xy32']
+        ox, oy = text_cache['origin']
+        tolerance_sq = tolerance * tolerance
+        # float32 coordinates are off by up to about 6e-8 of their magnitude,
+        # so the prefilter widens the radius by well over that and can only
+        # let extra candidates through, never drop a hit
+        slack = (text_cache['xy32_max'] + 2 * tolerance) * 1e-6
+        prefilter_sq = np.float32((tolerance + slack) ** 2 * (1 + 1e-5))
+        hits = []
+        for cx, cy in centers_xy.tolist():
+            gx, gy = int(cx // tolerance), int(cy // tolerance)
+            
+            # Any text within tolerance lies in this cell or one of its 8 neighbours
+            candidates = np.asarray([i for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                                     for i in grid.get((gx + dx, gy + dy), ())], dtype=np.intp)
+            if len(candidates) == 0:
+                hits.append(candidates)
+                continue
+            
+            diffs = text_xy32[candidates] - np.array((cx - ox, cy - oy), dtype=np.float32)
+            candidates = candidates[np.einsum('ij,ij->i', diffs, diffs) <= prefilter_sq]
+            
+            # Confirm the survivors in float64 exactly like the broadcast path
+            dx = cx - text_xy[candidates, 0]
+            dy = cy - text_xy[candidates, 1]
+            hits.append(np.sort(candidates[dx * dx + dy * dy <= tolerance_sq]))
+        return hits
+    
     def _find_plot_numbers_near_entities(self, entities: List[Dict]) -> List[str]:
         """Find plot numbers near the given entities."""
         plot_numbers = []
         tolerance = 100.0  # Increased tolerance
         
-        for entity in entities:
-            center = entity['center']
-            
-            # Check all text entities for plot numbers
-            for text_entity in self.msp:
-                if text_entity.dxftype() in ['TEXT', 'MTEXT']:
-                    text_content = ""
-                    if text_entity.dxftype() == 'TEXT':
-                        text_content = getattr(text_entity.dxf, 'text', '').strip()
-                    elif text_entity.dxftype() == 'MTEXT':
-                        text_content = getattr(text_entity.dxf, 'text', '').strip()
-                    
-                    if text_content:
-                        # Check if it's a plot number
-                        if self._is_plot_number(text_content) or self._is_simple_number(text_content):
-                            text_pos = (text_entity.dxf.insert.x, text_entity.dxf.insert.y)
-                            distance = self._calculate_distance(center, text_pos)
-                            
-                            if distance <= tolerance:
-                                # Clean and format the plot number
-                                plot_number = self._clean_plot_number(text_content)
-                                plot_numbers.append(plot_number)
+        text_cache = self._build_text_cache()
+        centers = [entity['center'] for entity in entities]
+        
+        for hits in self._query_texts_within(centers, 'is_candidate', tolerance):
+            for idx in hits:
+                plot_numbers.append(text_cache['cleaned'][idx])
         
         return sorted(set(plot_numbers), key=self._extract_numeric_plot_number)
     
     def _find_plot_number_for_entity(self, entity_center: Tuple[float, float]) -> Optional[str]:
         """Find the closest plot number for a specific entity."""
+        return self._find_plot_numbers_for_entities([entity_center])[0]
+    
+    def _find_plot_numbers_for_entities(self, entity_centers: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """
+        Find the closest plot number for each entity center, with all centers
+        resolved in one spatial index query and INSERT distance matrices of
+        at most _BROADCAST_MAX_PAIRS entries.
+        """
         tolerance = 100.0
-        closest_plot_number = None
-        closest_distance = float('inf')
-        
-        for text_entity in self.msp:
-            if text_entity.dxftype() in ['TEXT', 'MTEXT']:
-                text_content = ""
-                if text_entity.dxftype() == 'TEXT':
-                    text_content = getattr(text_entity.dxf, 'text', '').strip()
-                elif text_entity.dxftype() == 'MTEXT':
-                    text_content = getattr(text_entity.dxf, 'text', '').strip()
-                
-                if text_content:
-                    # Check if it's a plot number
-                    if self._is_plot_number(text_content) or self._is_simple_number(text_content):
-                        text_pos = (text_entity.dxf.insert.x, text_entity.dxf.insert.y)
-                        distance = self._calculate_distance(entity_center, text_pos)
-                        
-                        if distance <= tolerance and distance < closest_distance:
-                            closest_distance = distance
-                            closest_plot_number = self._clean_plot_number(text_content)
-        
-        # Also check INSERT entities (block references) which might contain plot numbers
-        for insert_entity in self.msp:
-            if insert_entity.dxftype() == 'INSERT':
-                block_name = insert_entity.dxf.name
-                # Check if block name could be a plot number
-                if self._is_plot_number(block_name) or self._is_simple_number(block_name):
-                    insert_pos = (insert_entity.dxf.insert.x, insert_entity.dxf.insert.y)
-                    distance = self._calculate_distance(entity_center, insert_pos)
-                    
-                    if distance <= tolerance and distance < closest_distance:
-                        closest_distance = distance
-                        closest_plot_number = self._clean_plot_number(block_name)
-        
-        return closest_plot_number
+        tolerance_sq = tolerance * tolerance
+        text_cache = self._build_text_cache()
+        centers_xy = np.asarray(entity_centers, dtype=np.float64).reshape(-1, 2)
+        
+        # Nearest plot number text from the spatial index
+        nearest = self._nearest_texts(centers_xy, 'is_candidate', tolerance)
+        closest_plot_numbers = [text_cache['cleaned'][i] if i >= 0 else None for i in nearest.tolist()]
+        closest_distance_sq = np.full(len(centers_xy), np.inf)
+        found = nearest >= 0
+        dx, dy = (centers_xy[found] - text_cache['xy'][nearest[found]]).T
+        closest_distance_sq[found] = dx * dx + dy * dy
+        
+        # Also check INSERT entities (block references) which might contain
+        # plot numbers; they win only when strictly closer than the text
+        insert_candidates = text_cache['insert_candidates']
+        if insert_candidates and len(centers_xy):
+            insert_xy = np.array([insert_pos for insert_pos, _ in insert_candidates], dtype=np.float64)
+            # Measure the centers in row blocks so memory stays bounded on
+            # drawings with many plots and block references
+            rows = max(1, _BROADCAST_MAX_PAIRS // len(insert_xy))
+            for start in range(0, len(centers_xy), rows):
+                block = slice(start, start + rows)
+                distances_sq = _pairwise_distances_sq(centers_xy[block], insert_xy)
+                distances_sq[distances_sq > tolerance_sq] = np.inf
+                nearest_insert = distances_sq.argmin(axis=1)  # first of equally near inserts
+                nearest_insert_sq = distances_sq[np.arange(len(nearest_insert)), nearest_insert]
+                for i in np.flatnonzero(nearest_insert_sq < closest_distance_sq[block]).tolist():
+                    closest_plot_numbers[start + i] = insert_candidates[nearest_insert[i]][1]
+        
+        return closest_plot_numbers
     
     def _generate_realistic_plot_number(self, index: int) -> str:
         """Generate realistic plot numbers based on typical DXF plot patterns."""
@@ -402,93 +793,77 @@ class PlotAnalyzer:
     
     def _is_plot_number(self, text: str) -> bool:
         """Check if text represents a plot number."""
-        text = text.strip().upper()
-        
-        patterns = [
-            r'^PLOT\s*#?\s*(\d+[A-Z]?/?\d*)$',  # PLOT 1, PLOT 2A, PLOT 30/A
-            r'^(\d+[A-Z]?/?\d*)$',              # 1, 2A, 30/A, 2/A
-            r'^P\s*(\d+[A-Z]?/?\d*)$',          # P1, P2A, P30/A
-            r'^NO\s*\.?\s*(\d+[A-Z]?/?\d*)$',   # NO 1, NO. 1, NO 30/A
-            r'^(\d+/\d+)$',                      # 2/A, 30/A, 1/2
-            r'^(\d+[A-Z]/\d+)$',                 # 2A/1, 30A/2
-        ]
+        text = text.strip()
         
-        for pattern in patterns:
-            if re.match(pattern, text):
-                return True
+        # Every plot number starts with a digit or a PLOT/P/NO prefix; check
+        # that before upper() so rejected labels are never copied
+        if not text or not (text[0].isdigit() or text[0] in 'PNpn'):
+            return False
         
-        return False
+        return _PLOT_NUMBER_RE.match(text.upper()) is not None
     
-    def _is_simple_number(self, text: str) -> bool:
-        """Check if text is a simple number that could be a plot number."""
+    def _is_plot_number_candidate(self, text: str) -> bool:
+        """
+        Check if text is a plot number or a simple number that could be one.
+        Every accepted pattern starts with a digit, 'P', 'N' or an uppercase
+        letter, so most labels (notes, titles, dimensions) are rejected before
+        any regex runs.
+        """
         text = text.strip()
+        if not text:
+            return False
         
-        # Check for simple numeric patterns
-        patterns = [
-            r'^\d+$',                    # 1, 2, 30, 100
-            r'^\d+[A-Z]$',              # 1A, 2B, 30A
-            r'^\d+/\d+$',               # 1/2, 2/A, 30/A
-            r'^\d+[A-Z]/\d+$',          # 1A/2, 2B/A
-            r'^[A-Z]\d+$',              # A1, B2, C30
-        ]
+        first = text[0]
+        if not (first.isdigit() or 'A' <= first <= 'Z' or first in 'pn'):
+            return False
         
-        for pattern in patterns:
-            if re.match(pattern, text):
-                return True
-        
-        return False
+        return self._is_plot_number(text) or self._is_simple_number(text)
+    
+    def _is_simple_number(self, text: str) -> bool:
+        """Check if text is a simple number that could be a plot number."""
+        return _SIMPLE_NUMBER_RE.match(text.strip()) is not None
     
     def _clean_plot_number(self, text: str) -> str:
         """Clean and format plot number to standard format."""
         text = text.strip().upper()
         
         # Remove common prefixes
-        prefixes_to_remove = ['PLOT', 'P', 'NO', 'NO.']
-        for prefix in prefixes_to_remove:
-            if text.startswith(prefix):
-                text = text[len(prefix):].strip()
+        text = _PREFIX_RE.sub('', text, count=1)
         
         # Remove extra spaces and special characters
-        text = re.sub(r'\s+', '', text)  # Remove spaces
-        text = re.sub(r'[#\.]', '', text)  # Remove # and .
+        text = _CLEAN_RE.sub('', text)  # Remove spaces, # and .
         
         return text
     
-    def _extract_numeric_plot_number(self, plot_number: str) -> int:
-        """Extract numeric part from plot number for sorting."""
-        if not plot_number:
-            return 999999
-        
-        # Extract first number from plot number
-        match = re.search(r'(\d+)', plot_number)
-        if match:
-            return int(match.group(1))
-        return 999999
+    # Module-level so results are shared across analyzers via lru_cache
+    _extract_numeric_plot_number = staticmethod(_extract_numeric_plot_number)
     
     def _is_survey_number(self, text: str) -> bool:
         """Check if text represents a survey number."""
         text = text.strip().upper()
         
-        # Patterns for survey numbers
-        patterns = [
-            r'^SURVEY\s*NO\s*\.?\s*(\d+[A-Z]?/?\d*)$',  # SURVEY NO 1, SURVEY NO. 1
-            r'^S\s*\.?\s*NO\s*\.?\s*(\d+[A-Z]?/?\d*)$', # S NO 1, S. NO. 1
-            r'^SURVEY\s*(\d+[A-Z]?/?\d*)$',             # SURVEY 1, SURVEY 30/A
-            r'^(\d+[A-Z]?/?\d*)\s*SURVEY$',             # 1 SURVEY, 30/A SURVEY
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, text):
-                return True
+        # Every survey number starts with S (SURVEY/S. NO.) or ends with SURVEY
+        if not text.startswith('S') and 'SURVEY' not in text:
+            return False
         
-        return False
+        return _SURVEY_NUMBER_RE.match(text) is not None
     
     def _calculate_entity_area_perimeter(self, entity) -> Tuple[float, float]:
+        """Calculate area and perimeter of an entity in raw DXF units (cached per handle)."""
+        handle = entity.dxf.handle
+        if handle is None:
+            return self._compute_entity_area_perimeter(entity)
+        
+        if handle not in self._area_cache:
+            self._area_cache[handle] = self._compute_entity_area_perimeter(entity)
+        return self._area_cache[handle]
+    
+    def _compute_entity_area_perimeter(self, entity) -> Tuple[float, float]:
         """Calculate area and perimeter of an entity in raw DXF units."""
         try:
             entity_type = entity.dxftype()
             
-            if entity_type in ['LWPOLYLINE', 'POLYLINE']:
+            if entity_type in _POLYLINE_TYPES:
                 return self._calculate_polygon_area_perimeter(entity)
             elif entity_type == 'CIRCLE':
                 radius = entity.dxf.radius
@@ -507,49 +882,127 @@ class PlotAnalyzer:
                 return 0.0, 0.0
                 
         except Exception as e:
-            print(f"Warning: Could not calculate area/perimeter for {entity_type}: {e}")
+            logger.warning("Warning: Could not calculate area/perimeter for %s: %s", entity_type, e)
             return 0.0, 0.0
     
     def _calculate_polygon_area_perimeter(self, entity) -> Tuple[float, float]:
         """Calculate area and perimeter of a polygon entity in raw DXF units."""
         try:
-            points = []
-            
-            if hasattr(entity, 'get_points'):
-                points = list(entity.get_points())
-            elif hasattr(entity, 'vertices'):
-                points = [(v.dxf.location.x, v.dxf.location.y) for v in entity.vertices]
+            return _polygon_area_perimeter(self._get_polygon_points(entity))
             
-            if len(points) < 3:
-                return 0.0, 0.0
-            
-            # Calculate area using shoelace formula
-            area = 0.0
-            perimeter = 0.0
+        except Exception as e:
+            logger.warning("Warning: Could not calculate polygon area/perimeter: %s", e)
+            return 0.0, 0.0
+    
+    def _get_polygon_points(self, entity) -> np.ndarray:
+        """Get the vertices of a polygon entity as an (n, 2) array."""
+        # LWPOLYLINE points are stored as (x, y, start_width, end_width, bulge)
+        # records, an (n, 5) float64 ndarray in current ezdxf and a flat
+        # array('d') in older releases; copy x, y out of either without
+        # building per-vertex tuples
+        values = getattr(getattr(entity, 'lwpoints', None), 'values', None)
+        if values is not None:
+            return np.asarray(values, dtype=np.float64).reshape(-1, 5)[:, :2].copy()
+        
+        if hasattr(entity, 'get_points'):
+            # Ask for x, y only rather than building full xyseb tuples
+            points = entity.get_points('xy')
+            return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        
+        if hasattr(entity, 'vertices'):
+            # Collect POLYLINE coordinates into a flat double buffer; appending
+            # to array('d') is cheaper than per-element ndarray assignment
+            coords = array('d')
+            for vertex in entity.vertices:
+                location = vertex.dxf.location
+                coords.append(location.x)
+                coords.append(location.y)
+            return np.frombuffer(coords, dtype=np.float64).reshape(-1, 2)
+        
+        return np.empty((0, 2), dtype=np.float64)
+    
+    def _calculate_plot_metrics(self, entities: List) -> List[Tuple[Tuple[float, float], float, float]]:
+        """
+        Calculate (center, area, perimeter) for a list of plot entities, with
+        area and perimeter in raw DXF units. Results are cached per handle,
+        and polyline vertices are extracted once and shared by all three
+        values. With Numba, very large batches of polylines are measured in
+        one compiled call; otherwise large batches are measured in a process
+        pool on multi-CPU hosts (ezdxf entities can't be pickled, so only
+        their vertex arrays are sent to the workers), falling back to a
+        sequential pass if the pool can't be started.
+        """
+        metrics = []
+        pending = []  # (metrics index, handle, vertices) still to be measured
+        
+        for entity in entities:
+            handle = entity.dxf.handle
+            if handle in self._center_cache and handle in self._area_cache:
+                metrics.append((self._center_cache[handle], *self._area_cache[handle]))
+                continue
             
-            for i in range(len(points)):
-                j = (i + 1) % len(points)
-                area += points[i][0] * points[j][1]
-                area -= points[j][0] * points[i][1]
-                
-                # Calculate perimeter
-                dx = points[j][0] - points[i][0]
-                dy = points[j][1] - points[i][1]
-                perimeter += np.sqrt(dx*dx + dy*dy)
+            if entity.dxftype() not in _POLYLINE_TYPES:
+                area, perimeter = self._calculate_entity_area_perimeter(entity)
+                metrics.append((self._get_entity_center(entity), area, perimeter))
+                continue
             
-            area = abs(area) / 2.0
+            try:
+                pts = self._get_polygon_points(entity)
+            except Exception as e:
+                logger.warning("Warning: Could not calculate polygon area/perimeter: %s", e)
+                metrics.append(((0.0, 0.0), 0.0, 0.0))
+                continue
             
-            return area, perimeter
+            center = (0.0, 0.0)
+            if len(pts):
+                cx, cy = pts.mean(axis=0)
+                center = (float(cx), float(cy))
+            if handle is not None:
+                self._center_cache[handle] = center
             
-        except Exception as e:
-            print(f"Warning: Could not calculate polygon area/perimeter: {e}")
-            return 0.0, 0.0
+            if handle in self._area_cache:
+                metrics.append((center, *self._area_cache[handle]))
+            else:
+                pending.append((len(metrics), handle, pts))
+                metrics.append((center, 0.0, 0.0))
+        
+        vertex_batches = [pts for _, _, pts in pending]
+        shoelace_batch = None
+        if len(pending) >= _NUMBA_MIN_POLYGONS:
+            shoelace_batch = _compiled_shoelace_batch()
+        
+        results = None
+        if shoelace_batch is not None:
+            # One compiled call over all vertices, ring k spanning offsets[k]:offsets[k + 1]
+            offsets = np.zeros(len(vertex_batches) + 1, dtype=np.int64)
+            np.cumsum([len(pts) for pts in vertex_batches], out=offsets[1:])
+            coords = np.concatenate(vertex_batches)
+            areas, perimeters = shoelace_batch(np.ascontiguousarray(coords[:, 0]),
+                                               np.ascontiguousarray(coords[:, 1]), offsets)
+            results = zip(areas.tolist(), perimeters.tolist())
+        elif len(pending) >= _PARALLEL_MIN_POLYGONS and (os.cpu_count() or 1) > 1:
+            try:
+                with ProcessPoolExecutor() as executor:
+                    results = list(executor.map(_polygon_area_perimeter, vertex_batches, chunksize=64))
+            except Exception as e:
+                # e.g. no working sem_open or process spawning is not allowed
+                logger.warning("Warning: Could not start a process pool, measuring sequentially: %s", e)
+        
+        if results is None:
+            results = [_polygon_area_perimeter(pts) for pts in vertex_batches]
+        
+        for (i, handle, _), (area, perimeter) in zip(pending, results):
+            if handle is not None:
+                self._area_cache[handle] = (area, perimeter)
+            metrics[i] = (metrics[i][0], area, perimeter)
+        
+        return metrics
     
     def convert_to_square_meters(self, area_raw: float) -> float:
         """Convert raw DXF area to square meters."""
         # Apply scale factor: 1CM = 20M, so 1 drawing unit = 20 meters
         # For area: 1 drawing unit² = (20 meters)² = 400 square meters
-        return area_raw * (self.scale_factor ** 2)
+        return area_raw * self.scale_factor_sq
     
     def convert_to_meters(self, distance_raw: float) -> float:
         """Convert raw DXF distance to meters."""
@@ -561,202 +1014,255 @@ class PlotAnalyzer:
         # First convert to square meters, then to square yards
         area_sq_m = self.convert_to_square_meters(area_raw)
         # 1 square meter = 1.19599 square yards
-        return area_sq_m * 1.19599
+        return area_sq_m * _SQ_YD_PER_SQ_M
     
     def convert_to_yards(self, distance_raw: float) -> float:
         """Convert raw DXF distance to yards."""
         # First convert to meters, then to yards
         distance_m = self.convert_to_meters(distance_raw)
         # 1 meter = 1.09361 yards
-        return distance_m * 1.09361
+        return distance_m * _YD_PER_M
     
     def analyze_text_entities(self) -> Dict:
         """
         Analyze all text entities to find potential plot numbers.
         """
-        print("\n🔍 Analyzing all text entities for plot numbers...")
+        logger.info("\n🔍 Analyzing all text entities for plot numbers...")
         
         all_text_entities = []
         potential_plot_numbers = []
         
         # First, let's see what entity types exist in the DXF file
-        entity_types = {}
-        for entity in self.msp:
-            entity_type = entity.dxftype()
-            entity_types[entity_type] = entity_types.get(entity_type, 0) + 1
+        entity_types = dict(self._classify_entities()['type_counts'])
         
-        print(f"   📊 Entity types found in DXF file:")
+        logger.info("   📊 Entity types found in DXF file:")
         for entity_type, count in sorted(entity_types.items()):
-            print(f"      {entity_type}: {count} entities")
-        
-        # Now check for text entities
-        for entity in self.msp:
-            if entity.dxftype() in ['TEXT', 'MTEXT']:
-                text_content = ""
-                if entity.dxftype() == 'TEXT':
-                    text_content = getattr(entity.dxf, 'text', '').strip()
-                elif entity.dxftype() == 'MTEXT':
-                    text_content = getattr(entity.dxf, 'text', '').strip()
-                
-                if text_content:
-                    all_text_entities.append({
-                        'content': text_content,
-                        'layer': entity.dxf.layer,
-                        'color': getattr(entity.dxf, 'color', 7),
-                        'position': (entity.dxf.insert.x, entity.dxf.insert.y)
-                    })
-                    
-                    # Check if this could be a plot number
-                    if self._is_plot_number(text_content) or self._is_simple_number(text_content):
-                        potential_plot_numbers.append({
-                            'content': text_content,
-                            'layer': entity.dxf.layer,
-                            'color': getattr(entity.dxf, 'color', 7),
-                            'position': (entity.dxf.insert.x, entity.dxf.insert.y),
-                            'cleaned': self._clean_plot_number(text_content)
-                        })
+            logger.info("      %s: %s entities", entity_type, count)
+        
+        # Now check for text entities, walking the cached parallel columns
+        text_cache = self._build_text_cache()
+        columns = zip(text_cache['content'], text_cache['layer'], text_cache['color'],
+                      text_cache['position'], text_cache['is_candidate'].tolist(), text_cache['cleaned'])
+        add_text = all_text_entities.append
+        add_potential = potential_plot_numbers.append
+        for text_content, layer, color, position, is_candidate, cleaned in columns:
+            text_info = {
+                'content': text_content,
+                'layer': layer,
+                'color': color,
+                'position': position
+            }
+            add_text(text_info)
+            
+            # Check if this could be a plot number
+            if is_candidate:
+                add_potential(dict(text_info, cleaned=cleaned))
         
         # Also check INSERT entities (block references) which might contain text
         insert_entities = []
-        for entity in self.msp:
-            if entity.dxftype() == 'INSERT':
-                block_name = entity.dxf.name
-                insert_entities.append({
-                    'block_name': block_name,
-                    'layer': entity.dxf.layer,
-                    'color': getattr(entity.dxf, 'color', 7),
-                    'position': (entity.dxf.insert.x, entity.dxf.insert.y)
-                })
-        
-        print(f"   📊 INSERT entities (block references): {len(insert_entities)}")
+        block_names = Counter()
+        add_insert = insert_entities.append
+        for entity in self._classify_entities()['inserts']:
+            dxf = entity.dxf
+            insert = dxf.insert
+            block_names[dxf.name] += 1
+            add_insert({
+                'block_name': dxf.name,
+                'layer': dxf.layer,
+                'color': getattr(dxf, 'color', 7),
+                'position': (insert.x, insert.y)
+            })
+        
+        logger.info("   📊 INSERT entities (block references): %s", len(insert_entities))
         if insert_entities:
-            block_names = {}
-            for insert in insert_entities:
-                block_name = insert['block_name']
-                block_names[block_name] = block_names.get(block_name, 0) + 1
-            
-            print(f"   📋 Block names found:")
-            for block_name, count in sorted(block_names.items())[:10]:  # Show first 10
-                print(f"      '{block_name}': {count} instances")
+            logger.info("   📋 Block names found:")
+            # First 10 alphabetically, without sorting every distinct name
+            for block_name, count in heapq.nsmallest(10, block_names.items()):
+                logger.info("      '%s': %s instances", block_name, count)
         
         result = {
             'total_text_entities': len(all_text_entities),
             'potential_plot_numbers': potential_plot_numbers,
             'all_text_entities': all_text_entities,
             'insert_entities': insert_entities,
-            'entity_types': entity_types
+            'entity_types': entity_types,
+            # Text positions and plot number flags as arrays, row-aligned
+            # with all_text_entities, for vectorized filtering
+            'text_positions': text_cache['xy'].copy(),
+            'potential_plot_mask': text_cache['is_candidate'].copy()
         }
         
-        print(f"   📝 Total text entities: {len(all_text_entities)}")
-        print(f"   🏷️  Potential plot numbers found: {len(potential_plot_numbers)}")
+        logger.info("   📝 Total text entities: %s", len(all_text_entities))
+        logger.info("   🏷️  Potential plot numbers found: %s", len(potential_plot_numbers))
         
         # Show some potential plot numbers
         if potential_plot_numbers:
-            print(f"   📋 Sample plot numbers: {[p['cleaned'] for p in potential_plot_numbers[:10]]}")
-            print(f"   📋 All potential plot numbers: {[p['cleaned'] for p in potential_plot_numbers]}")
+            if logger.isEnabledFor(logging.INFO):
+                cleaned = [p['cleaned'] for p in potential_plot_numbers]
+                logger.info("   📋 Sample plot numbers: %s", cleaned[:10])
+                logger.info("   📋 All potential plot numbers: %s", cleaned)
         else:
-            print(f"   ❌ No plot numbers found! Showing all text entities:")
+            logger.info("   ❌ No plot numbers found! Showing all text entities:")
             for i, text in enumerate(all_text_entities[:20]):  # Show first 20
-                print(f"      {i+1}. '{text['content']}' on layer '{text['layer']}'")
+                logger.info("      %s. '%s' on layer '%s'", i+1, text['content'], text['layer'])
         
         return result
     
     def _get_entity_center(self, entity) -> Tuple[float, float]:
+        """Get the center point of an entity (cached per handle)."""
+        handle = entity.dxf.handle
+        if handle is None:
+            return self._compute_entity_center(entity)
+        
+        center_cache = self._center_cache
+        center = center_cache.get(handle)
+        if center is None:
+            center = center_cache[handle] = self._compute_entity_center(entity)
+        return center
+    
+    def _compute_entity_center(self, entity) -> Tuple[float, float]:
         """Get the center point of an entity."""
         try:
-            if entity.dxftype() in ['LWPOLYLINE', 'POLYLINE']:
-                points = []
-                if hasattr(entity, 'get_points'):
-                    points = list(entity.get_points())
-                elif hasattr(entity, 'vertices'):
-                    points = [(v.dxf.location.x, v.dxf.location.y) for v in entity.vertices]
-                
-                if points:
-                    x_coords = [p[0] for p in points]
-                    y_coords = [p[1] for p in points]
-                    return (sum(x_coords) / len(x_coords), sum(y_coords) / len(y_coords))
+            entity_type = entity.dxftype()
+            if entity_type in _POLYLINE_TYPES:
+                pts = self._get_polygon_points(entity)
+                if len(pts):
+                    cx, cy = pts.mean(axis=0)
+                    return (float(cx), float(cy))
                     
-            elif entity.dxftype() == 'CIRCLE':
-                return (entity.dxf.center.x, entity.dxf.center.y)
+            elif entity_type == 'CIRCLE':
+                center = entity.dxf.center
+                return (center.x, center.y)
                 
-            elif entity.dxftype() == 'INSERT':
-                return (entity.dxf.insert.x, entity.dxf.insert.y)
+            elif entity_type == 'INSERT':
+                insert = entity.dxf.insert
+                return (insert.x, insert.y)
                 
         except Exception:
             pass
         
         return (0.0, 0.0)
     
-    def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
-        """Calculate distance between two points."""
-        dx = pos1[0] - pos2[0]
-        dy = pos1[1] - pos2[1]
-        return np.sqrt(dx*dx + dy*dy)
+    def _plot_report_units(self, plot: Dict) -> Tuple[float, float, float]:
+        """
+        (area sq yd, area sq m, perimeter yd) of one plot entity dict, using
+        the values converted by original_plots/final_plots when present.
+        """
+        if 'area_sq_yd' in plot:
+            return plot['area_sq_yd'], plot['area_sq_m'], plot['perim_yd']
+        
+        area_sq_m = self.convert_to_square_meters(plot['area'])
+        return area_sq_m * _SQ_YD_PER_SQ_M, area_sq_m, self.convert_to_yards(plot['perimeter'])
     
     def display_detailed_area_report(self, original_result: Dict, final_result: Dict) -> None:
         """
         Display a detailed area report for all plots in square yards.
         """
-        print("\n" + "="*80)
-        print("📋 DETAILED AREA REPORT (SQUARE YARDS)")
-        print("="*80)
+        sys.stdout.write("\n" + "="*80 + "\n📋 DETAILED AREA REPORT (SQUARE YARDS)\n" + "="*80 + "\n")
         
         # Original plots table
         if original_result['entities']:
-            print(f"\n🏷️  ORIGINAL PLOTS ({len(original_result['entities'])} plots):")
-            print("-" * 120)
-            print(f"{'Index':<6} {'Plot No.':<12} {'Area (sq yd)':<15} {'Perimeter (yd)':<15} {'Type':<12} {'Layer':<20}")
-            print("-" * 120)
+            lines = [
+                f"\n🏷️  ORIGINAL PLOTS ({len(original_result['entities'])} plots):",
+                "-" * 120,
+                f"{'Index':<6} {'Plot No.':<12} {'Area (sq yd)':<15} {'Perimeter (yd)':<15} {'Type':<12} {'Layer':<20}",
+                "-" * 120
+            ]
             
             for i, plot in enumerate(original_result['entities']):
                 # Use actual plot number if available, otherwise use sequential number
                 plot_num = plot.get('plot_number', str(i+1))
-                area_sq_yd = self.convert_to_square_yards(plot['area'])
-                perimeter_yd = self.convert_to_yards(plot['perimeter'])
-                print(f"{i+1:<6} {plot_num:<12} {area_sq_yd:<15.2f} "
-                      f"{perimeter_yd:<15.2f} {plot['type']:<12} {plot['layer']:<20}")
+                area_sq_yd, _, perimeter_yd = self._plot_report_units(plot)
+                lines.append(f"{i+1:<6} {plot_num:<12} {area_sq_yd:<15.2f} "
+                             f"{perimeter_yd:<15.2f} {plot['type']:<12} {plot['layer']:<20}")
+            
+            lines.append("-" * 120)
+            total_area_sq_yd = original_result['total_area_sq_meters'] * _SQ_YD_PER_SQ_M
+            lines.append(f"TOTAL: {total_area_sq_yd:.2f} sq yards")
             
-            print("-" * 120)
-            total_area_sq_yd = original_result['total_area_sq_meters'] * 1.19599
-            print(f"TOTAL: {total_area_sq_yd:.2f} sq yards")
+            # Emit the whole table with a single write instead of a print per row
+            sys.stdout.write("\n".join(lines) + "\n")
         
         # Final plots table
         if final_result['entities']:
-            print(f"\n🏷️  FINAL PLOTS ({len(final_result['entities'])} plots):")
-            print("-" * 120)
-            print(f"{'Index':<6} {'Plot No.':<12} {'Area (sq yd)':<15} {'Perimeter (yd)':<15} {'Type':<12} {'Layer':<20}")
-            print("-" * 120)
+            lines = [
+                f"\n🏷️  FINAL PLOTS ({len(final_result['entities'])} plots):",
+                "-" * 120,
+                f"{'Index':<6} {'Plot No.':<12} {'Area (sq yd)':<15} {'Perimeter (yd)':<15} {'Type':<12} {'Layer':<20}",
+                "-" * 120
+            ]
             
             for i, plot in enumerate(final_result['entities']):
                 # Use actual plot number if available, otherwise use sequential number
                 plot_num = plot.get('plot_number', str(i+1))
-                area_sq_yd = self.convert_to_square_yards(plot['area'])
-                perimeter_yd = self.convert_to_yards(plot['perimeter'])
-                print(f"{i+1:<6} {plot_num:<12} {area_sq_yd:<15.2f} "
-                      f"{perimeter_yd:<15.2f} {plot['type']:<12} {plot['layer']:<20}")
+                area_sq_yd, _, perimeter_yd = self._plot_report_units(plot)
+                lines.append(f"{i+1:<6} {plot_num:<12} {area_sq_yd:<15.2f} "
+                             f"{perimeter_yd:<15.2f} {plot['type']:<12} {plot['layer']:<20}")
             
-            print("-" * 120)
-            total_area_sq_yd = final_result['total_area_sq_meters'] * 1.19599
-            print(f"TOTAL: {total_area_sq_yd:.2f} sq yards")
+            lines.append("-" * 120)
+            total_area_sq_yd = final_result['total_area_sq_meters'] * _SQ_YD_PER_SQ_M
+            lines.append(f"TOTAL: {total_area_sq_yd:.2f} sq yards")
+            
+            # Emit the whole table with a single write instead of a print per row
+            sys.stdout.write("\n".join(lines) + "\n")
         
         # Summary
-        print(f"\n📊 SUMMARY:")
-        original_total_sq_yd = original_result['total_area_sq_meters'] * 1.19599
-        final_total_sq_yd = final_result['total_area_sq_meters'] * 1.19599
-        print(f"   Original plots: {original_result['total_entities']} (Total area: {original_total_sq_yd:.2f} sq yards)")
-        print(f"   Final plots: {final_result['total_entities']} (Total area: {final_total_sq_yd:.2f} sq yards)")
-        print(f"   Total plots: {original_result['total_entities'] + final_result['total_entities']}")
+        original_total_sq_yd = original_result['total_area_sq_meters'] * _SQ_YD_PER_SQ_M
+        final_total_sq_yd = final_result['total_area_sq_meters'] * _SQ_YD_PER_SQ_M
+        lines = [
+            f"\n📊 SUMMARY:",
+            f"   Original plots: {original_result['total_entities']} (Total area: {original_total_sq_yd:.2f} sq yards)",
+            f"   Final plots: {final_result['total_entities']} (Total area: {final_total_sq_yd:.2f} sq yards)",
+            f"   Total plots: {original_result['total_entities'] + final_result['total_entities']}"
+        ]
         
         if original_total_sq_yd > 0 and final_total_sq_yd > 0:
             area_diff = abs(original_total_sq_yd - final_total_sq_yd)
-            print(f"   Area difference: {area_diff:.2f} sq yards")
+            lines.append(f"   Area difference: {area_diff:.2f} sq yards")
         
-        print(f"\n📏 Scale Factor: 1CM = {self.scale_factor}M (1:2000)")
-        print(f"📐 Unit Conversion: 1 sq meter = 1.19599 sq yards, 1 meter = 1.09361 yards")
+        lines.append(f"\n📏 Scale Factor: 1CM = {self.scale_factor}M (1:2000)")
+        lines.append(f"📐 Unit Conversion: 1 sq meter = {_SQ_YD_PER_SQ_M} sq yards, 1 meter = {_YD_PER_M} yards")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Generate CSV files in the format of Table 1-4
         self.generate_csv_reports(original_result, final_result)
     
+    def _iter_csv_rows(self, original_result: Dict, final_result: Dict):
+        """
+        Yield the CSV data rows, one per original plot, paired with the final
+        plot at the same position.
+        """
+        # Pair each original plot with the final plot at the same position,
+        # or None once the final plots run out
+        final_plots = chain(final_result['entities'], repeat(None))
+        for i, (plot, final_plot) in enumerate(zip(original_result['entities'], final_plots), 1):
+            plot_num = plot.get('plot_number', str(i))
+            area_sq_yd, area_sq_m, perimeter_yd = self._plot_report_units(plot)
+            
+            if final_plot:
+                final_plot_num = final_plot.get('plot_number', 'NIL')
+                final_area_sq_yd, final_area_sq_m, final_perimeter_yd = self._plot_report_units(final_plot)
+            else:
+                final_plot_num = 'NIL'
+            
+            yield (
+                i,  # Case No.
+                f'Plot {plot_num}',  # NAME OF OWNER
+                'DXF',  # Tenure
+                f'R.S.{i}',  # R.S.NO.
+                plot_num,  # ORIGINAL PLOT
+                f'{area_sq_yd:.2f}',  # Area in (Sq.Yds.) - PRIMARY
+                f'{area_sq_m:.2f}',  # Area in (Sq.m) - SECONDARY
+                f'{perimeter_yd:.2f}',  # Perimeter (yd)
+                final_plot_num,  # FINAL PLOT
+                f'{final_area_sq_yd:.2f}' if final_plot else '',  # Final Area in (Sq.Yds.) - PRIMARY
+                f'{final_area_sq_m:.2f}' if final_plot else '',  # Final Area in (Sq.m) - SECONDARY
+                f'{final_perimeter_yd:.2f}' if final_plot else '',  # Final Perimeter (yd)
+                plot['type'],  # Type
+                plot['layer'],  # Layer
+                f'Original plot {plot_num}'  # REMARKS
+            )
+    
     def generate_csv_reports(self, original_result: Dict, final_result: Dict) -> None:
         """
         Generate CSV reports in the format of Table 1-4 with square yards as primary unit.
@@ -766,7 +1272,7 @@ class PlotAnalyzer:
         # Create CSV for Original Plots (Table format)
         csv_filename = "plot_analysis_report.csv"
         
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open(csv_filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
             writer = csv.writer(csvfile)
             
             # Write header in the format similar to Table 1-4
@@ -777,101 +1283,67 @@ class PlotAnalyzer:
                 'Type', 'Layer', 'REMARKS'
             ])
             
-            # Write data rows
-            for i, plot in enumerate(original_result['entities'], 1):
-                plot_num = plot.get('plot_number', str(i))
-                area_sq_yd = self.convert_to_square_yards(plot['area'])
-                area_sq_m = self.convert_to_square_meters(plot['area'])
-                perimeter_yd = self.convert_to_yards(plot['perimeter'])
-                
-                # Find corresponding final plot if exists
-                final_plot = None
-                if i <= len(final_result['entities']):
-                    final_plot = final_result['entities'][i-1]
-                
-                # Calculate final plot values if exists
-                final_area_sq_yd = 0.0
-                final_area_sq_m = 0.0
-                final_perimeter_yd = 0.0
-                final_plot_num = 'NIL'
-                
-                if final_plot:
-                    final_plot_num = final_plot.get('plot_number', 'NIL')
-                    final_area_sq_yd = self.convert_to_square_yards(final_plot['area'])
-                    final_area_sq_m = self.convert_to_square_meters(final_plot['area'])
-                    final_perimeter_yd = self.convert_to_yards(final_plot['perimeter'])
-                
-                writer.writerow([
-                    i,  # Case No.
-                    f'Plot {plot_num}',  # NAME OF OWNER
-                    'DXF',  # Tenure
-                    f'R.S.{i}',  # R.S.NO.
-                    plot_num,  # ORIGINAL PLOT
-                    f'{area_sq_yd:.2f}',  # Area in (Sq.Yds.) - PRIMARY
-                    f'{area_sq_m:.2f}',  # Area in (Sq.m) - SECONDARY
-                    f'{perimeter_yd:.2f}',  # Perimeter (yd)
-                    final_plot_num,  # FINAL PLOT
-                    f'{final_area_sq_yd:.2f}' if final_plot else '',  # Final Area in (Sq.Yds.) - PRIMARY
-                    f'{final_area_sq_m:.2f}' if final_plot else '',  # Final Area in (Sq.m) - SECONDARY
-                    f'{final_perimeter_yd:.2f}' if final_plot else '',  # Final Perimeter (yd)
-                    plot['type'],  # Type
-                    plot['layer'],  # Layer
-                    f'Original plot {plot_num}'  # REMARKS
-                ])
-        
-        print(f"\n📄 CSV Report generated: {csv_filename}")
-        print(f"   Format: Similar to Table 1-4 with sequential plot numbers")
-        print(f"   Primary unit: Square Yards (Sq.Yds.)")
-        print(f"   Secondary unit: Square Meters (Sq.m)")
+            # Rows are assembled lazily and streamed straight into the buffer
+            writer.writerows(self._iter_csv_rows(original_result, final_result))
+        
+        sys.stdout.write(f"\n📄 CSV Report generated: {csv_filename}\n"
+                         "   Format: Similar to Table 1-4 with sequential plot numbers\n"
+                         "   Primary unit: Square Yards (Sq.Yds.)\n"
+                         "   Secondary unit: Square Meters (Sq.m)\n")
 
     def extract_plot_numbers_from_dxf(self) -> List[str]:
         """
         Extract actual plot numbers from the DXF file by analyzing text entities.
         """
-        print("\n🔍 Extracting actual plot numbers from DXF file...")
+        logger.info("\n🔍 Extracting actual plot numbers from DXF file...")
         
         plot_numbers = set()
+        layer_is_plot = {}  # layer names repeat, classify each one once
+        is_plot_number = self._is_plot_number
         
-        # Search through all entities for plot numbers
-        for entity in self.msp:
+        # Search through all entities (cached in DXF order) for plot numbers
+        for entity in self._classify_entities()['entities']:
             entity_type = entity.dxftype()
+            dxf = entity.dxf
             
             # Check TEXT entities
             if entity_type == 'TEXT':
-                text = getattr(entity.dxf, 'text', '').strip()
-                if text and self._is_plot_number(text):
+                text = getattr(dxf, 'text', '').strip()
+                if text and is_plot_number(text):
                     plot_numbers.add(text)
-                    print(f"   Found TEXT plot number: '{text}'")
+                    logger.info("   Found TEXT plot number: '%s'", text)
             
             # Check MTEXT entities
             elif entity_type == 'MTEXT':
-                text = getattr(entity.dxf, 'text', '').strip()
-                if text and self._is_plot_number(text):
+                text = getattr(dxf, 'text', '').strip()
+                if text and is_plot_number(text):
                     plot_numbers.add(text)
-                    print(f"   Found MTEXT plot number: '{text}'")
+                    logger.info("   Found MTEXT plot number: '%s'", text)
             
             # Check INSERT entities (block references)
             elif entity_type == 'INSERT':
-                block_name = getattr(entity.dxf, 'name', '').strip()
-                if block_name and self._is_plot_number(block_name):
+                block_name = getattr(dxf, 'name', '').strip()
+                if block_name and is_plot_number(block_name):
                     plot_numbers.add(block_name)
-                    print(f"   Found INSERT plot number: '{block_name}'")
+                    logger.info("   Found INSERT plot number: '%s'", block_name)
             
             # Check layer names
-            layer_name = getattr(entity.dxf, 'layer', '').strip()
-            if layer_name and self._is_plot_number(layer_name):
+            layer_name = getattr(dxf, 'layer', '').strip()
+            if layer_name not in layer_is_plot:
+                layer_is_plot[layer_name] = bool(layer_name) and is_plot_number(layer_name)
+            if layer_is_plot[layer_name]:
                 plot_numbers.add(layer_name)
-                print(f"   Found LAYER plot number: '{layer_name}'")
+                logger.info("   Found LAYER plot number: '%s'", layer_name)
         
         # Sort plot numbers
         sorted_plot_numbers = sorted(plot_numbers, key=self._extract_numeric_plot_number)
         
         if sorted_plot_numbers:
-            print(f"\n📋 Actual plot numbers found in DXF: {sorted_plot_numbers}")
-            print(f"   Total unique plot numbers: {len(sorted_plot_numbers)}")
+            logger.info("\n📋 Actual plot numbers found in DXF: %s", sorted_plot_numbers)
+            logger.info("   Total unique plot numbers: %s", len(sorted_plot_numbers))
         else:
-            print(f"\n⚠️  NO PLOT NUMBERS FOUND IN DXF FILE!")
-            print(f"   The DXF file does not contain any plot number labels")
+            logger.info("\n⚠️  NO PLOT NUMBERS FOUND IN DXF FILE!")
+            logger.info("   The DXF file does not contain any plot number labels")
         
         return sorted_plot_numbers
 
@@ -879,6 +1351,11 @@ def main():
     """
     Main function to load DXF file and call all analysis functions.
     """
+    # Analyzer progress goes through logging; show it like the report output
+    # without turning on INFO messages from ezdxf
+    logging.basicConfig(format='%(message)s', stream=sys.stdout)
+    logger.setLevel(logging.INFO)
+    
     print("="*70)
     print("PLOT ANALYZER - DXF FILE ANALYSIS")
     print("="*70)
@@ -0,0 +1,385 @@
+"""
+Equivalence tests for the interchangeable fast paths in plot_analyzer.
+
+The shipped drawing only exercises one strategy of each kind, so every
+strategy switch (broadcast, grid and STRtree radius queries; NumPy, Numba
+and process pool polygon measurement) is forced in turn on a randomized
+drawing and checked against a plain reference implementation.
+
+Run with: python -m unittest discover -s tests
+"""
+import csv
+import io
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ezdxf
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plot_analyzer as pa
+
+LABELS = ['1', '2/A', 'P 5', 'PLOT # 7', 'NO. 9', 'S. NO. 4', 'SURVEY 12', '12 SURVEY',
+          'A1', 'hello', '30A/2', 'N', 'plot 3b', '']
+BLOCK_NAMES = ['7', 'P12', 'ABC', '12A', 'X']
+
+_tmpdir = None
+_drawing = None
+
+
+def make_drawing(path: str, seed: int, plots: int, texts: int, inserts: int, span: float) -> None:
+    """Write a drawing with random plot outlines, labels and block references."""
+    rng = random.Random(seed)
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    for name in BLOCK_NAMES:
+        doc.blocks.new(name=name)
+
+    for _ in range(plots):
+        cx, cy = rng.uniform(0, span), rng.uniform(0, span)
+        color = rng.choice([1, 3, 3, 1, 5, 256])
+        k = rng.randint(1, 8)
+        radius = rng.uniform(5, 40)
+        points = [(cx + radius * math.cos(2 * math.pi * j / k), cy + radius * math.sin(2 * math.pi * j / k))
+                  for j in range(k)]
+        r = rng.random()
+        if r < 0.5:
+            msp.add_lwpolyline(points, dxfattribs={'color': color})
+        elif r < 0.8:
+            msp.add_polyline2d(points, dxfattribs={'color': color})
+        else:
+            msp.add_circle((cx, cy), radius, dxfattribs={'color': color})
+
+    for _ in range(texts):
+        insert = (rng.uniform(0, span), rng.uniform(0, span))
+        label = rng.choice(LABELS)
+        if rng.random() < 0.5:
+            msp.add_text(label, dxfattribs={'insert': insert, 'layer': rng.choice(['0', 'L1', '5'])})
+        else:
+            msp.add_mtext(label, dxfattribs={'insert': insert})
+
+    for _ in range(inserts):
+        msp.add_blockref(rng.choice(BLOCK_NAMES), (rng.uniform(0, span), rng.uniform(0, span)))
+
+    doc.saveas(path)
+
+
+def setUpModule():
+    global _tmpdir, _drawing
+    _tmpdir = tempfile.mkdtemp()
+    _drawing = os.path.join(_tmpdir, 'random.dxf')
+    make_drawing(_drawing, seed=1, plots=400, texts=1500, inserts=40, span=1500.0)
+
+
+def tearDownModule():
+    shutil.rmtree(_tmpdir, ignore_errors=True)
+
+
+def reference_shoelace(points):
+    """Area and perimeter with the original scalar loop."""
+    area = 0.0
+    perimeter = 0.0
+    n = len(points)
+    for i in range(n):
+        j = (i + 1) % n
+        area += points[i][0] * points[j][1]
+        area -= points[j][0] * points[i][1]
+        dx = points[j][0] - points[i][0]
+        dy = points[j][1] - points[i][1]
+        perimeter += math.sqrt(dx * dx + dy * dy)
+    return abs(area) / 2.0, perimeter
+
+
+def reference_clean_plot_number(text: str) -> str:
+    """Plot number cleaning with the original sequential prefix stripping."""
+    import re
+    text = text.strip().upper()
+    for prefix in ['PLOT', 'P', 'NO', 'NO.']:
+        if text.startswith(prefix):
+            text = text[len(prefix):].strip()
+    text = re.sub(r'\s+', '', text)
+    return re.sub(r'[#\.]', '', text)
+
+
+def reference_nearest_plot_number(analyzer, center):
+    """Closest plot number label by a scan over every entity, as originally written."""
+    tolerance = 100.0
+    closest_plot_number = None
+    closest_distance = float('inf')
+    for entity in analyzer.msp:
+        if entity.dxftype() in ('TEXT', 'MTEXT'):
+            text = getattr(entity.dxf, 'text', '').strip()
+            if text and (analyzer._is_plot_number(text) or analyzer._is_simple_number(text)):
+                insert = entity.dxf.insert
+                distance = math.hypot(center[0] - insert.x, center[1] - insert.y)
+                if distance <= tolerance and distance < closest_distance:
+                    closest_distance = distance
+                    closest_plot_number = analyzer._clean_plot_number(text)
+    for entity in analyzer.msp:
+        if entity.dxftype() == 'INSERT':
+            name = entity.dxf.name
+            if analyzer._is_plot_number(name) or analyzer._is_simple_number(name):
+                insert = entity.dxf.insert
+                distance = math.hypot(center[0] - insert.x, center[1] - insert.y)
+                if distance <= tolerance and distance < closest_distance:
+                    closest_distance = distance
+                    closest_plot_number = analyzer._clean_plot_number(name)
+    return closest_plot_number
+
+
+class ShoelaceKernelTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.rings = [rng.random((int(rng.integers(3, 60)), 2)) * scale + offset
+                      for scale, offset in [(1.0, 0.0), (1e3, 1e5), (1e6, 0.0)] for _ in range(300)]
+
+    def test_numpy_kernel_matches_scalar_loop(self):
+        for ring in self.rings:
+            expected = reference_shoelace(ring.tolist())
+            self.assertEqual(pa._polygon_area_perimeter(ring), expected)
+
+    def test_compiled_batch_matches_numpy_kernel(self):
+        shoelace_batch = pa._compiled_shoelace_batch()
+        if shoelace_batch is None:
+            self.skipTest('numba is not installed')
+
+        offsets = np.zeros(len(self.rings) + 1, dtype=np.int64)
+        np.cumsum([len(ring) for ring in self.rings], out=offsets[1:])
+        coords = np.concatenate(self.rings)
+        areas, perimeters = shoelace_batch(np.ascontiguousarray(coords[:, 0]),
+                                           np.ascontiguousarray(coords[:, 1]), offsets)
+        expected = [pa._polygon_area_perimeter(ring) for ring in self.rings]
+        self.assertEqual(list(zip(areas.tolist(), perimeters.tolist())), expected)
+
+
+class PlotMetricsTests(unittest.TestCase):
+    """Every polygon measurement path gives the same metrics."""
+
+    def measure(self, **tunables):
+        analyzer = pa.PlotAnalyzer(_drawing)
+        with mock.patch.multiple(pa, **tunables):
+            return analyzer._calculate_plot_metrics(analyzer._classify_entities()['plot_entities'])
+
+    def sequential(self):
+        return self.measure(_NUMBA_MIN_POLYGONS=float('inf'), _PARALLEL_MIN_POLYGONS=float('inf'))
+
+    def test_sequential_path_matches_scalar_loop(self):
+        analyzer = pa.PlotAnalyzer(_drawing)
+        entities = analyzer._classify_entities()['plot_entities']
+        for entity, (_, area, perimeter) in zip(entities, self.sequential()):
+            if entity.dxftype() in ('LWPOLYLINE', 'POLYLINE'):
+                points = analyzer._get_polygon_points(entity).tolist()
+                expected = reference_shoelace(points) if len(points) >= 3 else (0.0, 0.0)
+                self.assertEqual((area, perimeter), expected)
+
+    def test_compiled_batch_path(self):
+        if pa._compiled_shoelace_batch() is None:
+            self.skipTest('numba is not installed')
+        self.assertEqual(self.measure(_NUMBA_MIN_POLYGONS=0), self.sequential())
+
+    def test_without_numba(self):
+        # False marks Numba as unavailable, as after a failed import
+        self.assertEqual(self.measure(_shoelace_batch=False, _NUMBA_MIN_POLYGONS=0), self.sequential())
+
+    def test_process_pool_path(self):
+        with mock.patch.object(pa.os, 'cpu_count', return_value=4):
+            metrics = self.measure(_shoelace_batch=False, _NUMBA_MIN_POLYGONS=0, _PARALLEL_MIN_POLYGONS=0)
+        self.assertEqual(metrics, self.sequential())
+
+    def test_process_pool_not_used_on_one_cpu(self):
+        with mock.patch.object(pa.os, 'cpu_count', return_value=1), \
+                mock.patch.object(pa, 'ProcessPoolExecutor') as executor:
+            metrics = self.measure(_shoelace_batch=False, _NUMBA_MIN_POLYGONS=0, _PARALLEL_MIN_POLYGONS=0)
+        executor.assert_not_called()
+        self.assertEqual(metrics, self.sequential())
+
+    def test_process_pool_failure_falls_back_to_sequential(self):
+        with mock.patch.object(pa.os, 'cpu_count', return_value=4), \
+                mock.patch.object(pa, 'ProcessPoolExecutor', side_effect=OSError('no sem_open')), \
+                self.assertLogs('plot_analyzer', level='WARNING'):
+            metrics = self.measure(_shoelace_batch=False, _NUMBA_MIN_POLYGONS=0, _PARALLEL_MIN_POLYGONS=0)
+        self.assertEqual(metrics, self.sequential())
+
+
+class RadiusQueryTests(unittest.TestCase):
+    """Broadcast, grid and STRtree radius queries return the same hits."""
+
+    PATHS = {
+        'broadcast': dict(_BROADCAST_MAX_PAIRS=10 ** 12),
+        'grid': dict(_BROADCAST_MAX_PAIRS=0, _GRID_MIN_TEXTS_PER_CELL=0.0),
+        'tree': dict(_BROADCAST_MAX_PAIRS=0, _GRID_MIN_TEXTS_PER_CELL=float('inf')),
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = pa.PlotAnalyzer(_drawing)
+        rng = random.Random(2)
+        cls.centers = [center for center, _, _ in cls.analyzer._calculate_plot_metrics(
+            cls.analyzer._classify_entities()['plot_entities'])]
+        cls.centers += [(rng.uniform(-100, 1600), rng.uniform(-100, 1600)) for _ in range(300)]
+
+    def reference_hits(self, flag, tolerance):
+        text_cache = self.analyzer._build_text_cache()
+        text_idx = np.flatnonzero(text_cache[flag])
+        hits = []
+        for cx, cy in self.centers:
+            hits.append([int(i) for i in text_idx
+                         if (cx - text_cache['xy'][i, 0]) ** 2 + (cy - text_cache['xy'][i, 1]) ** 2
+                         <= tolerance * tolerance])
+        return hits
+
+    def test_all_paths_match_reference(self):
+        for flag in ('is_plot', 'is_survey', 'is_candidate'):
+            for tolerance in (50.0, 100.0):
+                expected = self.reference_hits(flag, tolerance)
+                for path, tunables in self.PATHS.items():
+                    with self.subTest(flag=flag, tolerance=tolerance, path=path), \
+                            mock.patch.multiple(pa, **tunables):
+                        hits = self.analyzer._query_texts_within(self.centers, flag, tolerance)
+                        self.assertEqual([h.tolist() for h in hits], expected)
+
+    def test_all_paths_agree_at_the_tolerance_boundary(self):
+        # Texts far from the text-set origin, where float32 coordinates are
+        # off by several thousandths, probed just inside, on and just outside
+        # the tolerance
+        path = os.path.join(_tmpdir, 'boundary.dxf')
+        doc = ezdxf.new()
+        msp = doc.modelspace()
+        msp.add_text('1', dxfattribs={'insert': (0.0, 0.0)})
+        msp.add_text('2', dxfattribs={'insert': (60000.0, 0.0)})
+        msp.add_text('3', dxfattribs={'insert': (60000.0, 60000.0)})
+        doc.saveas(path)
+        analyzer = pa.PlotAnalyzer(path)
+
+        centers = []
+        for tx, ty in ((60000.0, 0.0), (60000.0, 60000.0)):
+            for offset in (49.999, 50.0, 50.001):
+                centers += [(tx + offset, ty), (tx, ty - offset)]
+            centers += [(tx + 30.0, ty + 40.0), (tx + 30.0, ty + 40.001)]
+        text_xy = analyzer._build_text_cache()['xy']
+        expected = [[int(i) for i in range(len(text_xy))
+                     if (cx - text_xy[i, 0]) ** 2 + (cy - text_xy[i, 1]) ** 2 <= 2500.0]
+                    for cx, cy in centers]
+        self.assertIn([], expected)
+        self.assertIn([1], expected)
+
+        for path_name, tunables in self.PATHS.items():
+            with self.subTest(path=path_name), mock.patch.multiple(pa, **tunables):
+                hits = analyzer._query_texts_within(centers, 'is_plot', 50.0)
+                self.assertEqual([h.tolist() for h in hits], expected)
+
+
+class PlotNumberLookupTests(unittest.TestCase):
+    def test_batched_nearest_matches_per_entity_scan(self):
+        analyzer = pa.PlotAnalyzer(_drawing)
+        rng = random.Random(3)
+        centers = [center for center, _, _ in analyzer._calculate_plot_metrics(
+            analyzer._classify_entities()['plot_entities'])]
+        centers += [(rng.uniform(0, 1500), rng.uniform(0, 1500)) for _ in range(200)]
+
+        expected = [reference_nearest_plot_number(analyzer, center) for center in centers]
+        self.assertEqual(analyzer._find_plot_numbers_for_entities(centers), expected)
+        # INSERT distances measured a few rows at a time, and one row at a time
+        for max_pairs in (7 * len(analyzer._build_text_cache()['insert_candidates']), 1):
+            with self.subTest(max_pairs=max_pairs), mock.patch.object(pa, '_BROADCAST_MAX_PAIRS', max_pairs):
+                self.assertEqual(analyzer._find_plot_numbers_for_entities(centers), expected)
+        self.assertEqual([analyzer._find_plot_number_for_entity(c) for c in centers[:50]], expected[:50])
+        self.assertTrue(any(expected))
+
+    def fuzz_strings(self, count):
+        rng = random.Random(0)
+        alphabet = ['1', '2', '0', '9', 'A', 'B', 'a', 'p', 'n', 'o', '/', '.', '#', ' ', '\t',
+                    ' ', 'P', 'PLOT', 'plot', 'NO', 'NO.', 'No', 'S', 'SURVEY', 'x', '\n', 'ß']
+        return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))) for _ in range(count)]
+
+    def test_clean_plot_number_matches_sequential_prefix_stripping(self):
+        analyzer = pa.PlotAnalyzer.__new__(pa.PlotAnalyzer)
+        for text in self.fuzz_strings(50_000):
+            self.assertEqual(analyzer._clean_plot_number(text), reference_clean_plot_number(text), repr(text))
+
+    def test_candidate_check_matches_full_classification(self):
+        analyzer = pa.PlotAnalyzer.__new__(pa.PlotAnalyzer)
+        for text in self.fuzz_strings(50_000):
+            expected = analyzer._is_plot_number(text) or analyzer._is_simple_number(text)
+            self.assertEqual(analyzer._is_plot_number_candidate(text), expected, repr(text))
+
+
+class PlotResultTests(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = pa.PlotAnalyzer(_drawing)
+
+    def test_cached_results_are_copies(self):
+        result = self.analyzer.original_plots()
+        count = len(result['entities'])
+        result['entities'].pop()
+        result['plot_numbers'].clear()
+        again = self.analyzer.original_plots()
+        self.assertEqual(len(again['entities']), count)
+        self.assertTrue(again['plot_numbers'])
+
+    def test_cached_results_survive_in_place_edits(self):
+        result = self.analyzer.original_plots()
+        areas = result['areas'].copy()
+        centers = result['centers'].copy()
+        plot_number = result['entities'][0]['plot_number']
+        result['areas'] *= 0
+        result['perimeters'] *= 0
+        result['centers'][:] = 0
+        result['entities'][0]['plot_number'] = 'MUTATED'
+        result['entities'][0]['area_sq_yd'] = -1.0
+
+        again = self.analyzer.original_plots()
+        np.testing.assert_array_equal(again['areas'], areas)
+        np.testing.assert_array_equal(again['centers'], centers)
+        self.assertTrue(again['perimeters'].any())
+        self.assertEqual(again['entities'][0]['plot_number'], plot_number)
+        self.assertGreaterEqual(again['entities'][0]['area_sq_yd'], 0.0)
+        self.assertAlmostEqual(self.analyzer.convert_to_square_meters(again['areas'].sum()),
+                               again['total_area_sq_meters'])
+
+    def test_cache_follows_plot_color(self):
+        final_count = self.analyzer.final_plots()['total_entities']
+        self.analyzer.original_plots()
+        self.analyzer.ORIGINAL_COLOR = self.analyzer.FINAL_COLOR
+        self.assertEqual(self.analyzer.original_plots()['total_entities'], final_count)
+
+    def test_reports_follow_filtered_entities(self):
+        original = self.analyzer.original_plots()
+        final = self.analyzer.final_plots()
+        # Filter and reorder the entities, and drop the per-plot arrays
+        original['entities'] = original['entities'][::-2]
+        final['entities'] = final['entities'][1::2]
+        del original['areas'], final['areas']
+        expected_sq_yd = [f"{self.analyzer.convert_to_square_yards(plot['area']):.2f}"
+                          for plot in original['entities']]
+
+        cwd = os.getcwd()
+        os.chdir(_tmpdir)
+        try:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.analyzer.display_detailed_area_report(original, final)
+            with open('plot_analysis_report.csv', newline='', encoding='utf-8') as csvfile:
+                rows = list(csv.reader(csvfile))[1:]
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual([row[5] for row in rows], expected_sq_yd)
+        for row, final_plot in zip(rows, final['entities']):
+            self.assertEqual(row[9], f"{self.analyzer.convert_to_square_yards(final_plot['area']):.2f}")
+
+        table = output.getvalue().split('ORIGINAL PLOTS')[1].split('TOTAL:')[0]
+        printed = [line.split()[2] for line in table.splitlines() if line[:1].isdigit()]
+        self.assertEqual(printed, expected_sq_yd)
+
+
+if __name__ == '__main__':
+    unittest.main()